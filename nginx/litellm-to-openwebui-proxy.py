@@ -2,21 +2,43 @@
 
 # Standard library
 import argparse
+import asyncio
+import importlib.util
+import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-import json
 import logging
-from typing import Any, Dict, Optional
+import logging.handlers
+import queue
+import time
+from typing import Any, AsyncIterator, Dict, Optional
 
 # Third-party
 import httpx
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, Response
-import litellm
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import orjson
+from starlette.background import BackgroundTask
 from starlette.middleware.cors import CORSMiddleware
 import uvicorn
 
 # Local
-from vault import VaultClient
+from vault import VaultClient, VaultError
+
+# Prefer the C event loop / HTTP parser when installed (uvloop is not
+# available on Windows); otherwise let uvicorn pick its defaults.
+_UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+_UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
+# Bounds for the in-process cache of Vault secrets keyed by bearer key
+_SECRET_CACHE_TTL = 60.0
+_SECRET_CACHE_MAX = 1024
+
+# Shared empty preflight reply; Starlette responses hold no per-request state
+_PREFLIGHT_204 = Response(status_code=204)
+
+# Import name of this file, used by uvicorn worker processes to locate app_factory
+_MODULE_NAME = os.path.splitext(os.path.basename(__file__))[0]
 
 
 class MCPAdapterProxy:
@@ -31,7 +53,8 @@ class MCPAdapterProxy:
             vault_addr: str,
             token: str,
             mount: str,
-            path: str
+            path: str,
+            upstream_http2: bool = False
         ) -> None:
             self.litellm_url: str = litellm_url.rstrip("/")
             self.timeout: float = timeout
@@ -42,6 +65,7 @@ class MCPAdapterProxy:
             self.token: str = token
             self.mount: str = mount
             self.path: str = path
+            self.upstream_http2: bool = upstream_http2
 
     @classmethod
     def build_settings_from_args(cls, args: argparse.Namespace) -> "MCPAdapterProxy.Settings":
@@ -54,7 +78,8 @@ class MCPAdapterProxy:
             vault_addr=args.vault_addr,
             token=args.token,
             mount=args.mount,
-            path=args.path
+            path=args.path,
+            upstream_http2=args.upstream_http2
         )
 
     @staticmethod
@@ -66,6 +91,8 @@ class MCPAdapterProxy:
                             help="Host to bind (default: 0.0.0.0)")
         parser.add_argument("--port", type=int, default=8088,
                             help="Port to bind (default: 8088)")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Number of uvicorn worker processes, e.g. 2*CPU+1 (default: 1)")
         parser.add_argument(
             "--litellm-url",
             dest="litellm_url",
@@ -80,6 +107,8 @@ class MCPAdapterProxy:
             choices=["debug", "info", "warning", "error", "critical"],
             help="Log level (default: info)",
         )
+        parser.add_argument("--upstream-http2", dest="upstream_http2", action="store_true",
+                            help="Use HTTP/2 to LiteLLM (requires h2 and an HTTP/2 capable upstream)")
         parser.add_argument("--enable-cors", action="store_true",
                             help="Enable CORS on the adapter")
         parser.add_argument(
@@ -118,28 +147,58 @@ class MCPAdapterProxy:
         Raises:
             ValueError: If the input does not start with 'Bearer'.
         """
+        # Fast path for the well-formed header: no list allocation from split()
+        if text.startswith("Bearer "):
+            key = text[7:].strip()
+            if key:
+                return key
         parts = text.strip().split(None, 1)
         if len(parts) != 2 or parts[0] != "Bearer":
             raise ValueError("string does not start with Bearer")
         return parts[1]
 
-    def _fetch_secret_for_authorization(self, authorization: str) -> str:
+    async def _secret_for_authorization(self, authorization: str) -> str:
         """
-        Extract 'sk-...' from 'Bearer sk-...' and fetch its secret from Vault.
+        Extract 'sk-...' from 'Bearer sk-...' and return its secret from Vault.
+
+        Fresh secrets are served from the cache. On a miss only the blocking
+        Vault read runs in a worker thread; the cache itself is only read and
+        written here, on the event loop.
 
         Returns:
-            The extracted key string.
+            The secret stored in Vault for the key.
 
         Raises:
-            ValueError: If the authorization string is of an invalid format.
+            ValueError: If the authorization string is of an invalid format,
+                or Vault has no secret for the key.
         """
         key = self._get_auth_key(authorization)
-        auth_key: str | None = self._vault_client.get_kv(
-            path=self._settings.path,            key=key)
+        cache = self._secret_cache
+        cached = cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _SECRET_CACHE_TTL:
+            return cached[1]
+
+        auth_key: str | None = await asyncio.to_thread(
+            self._vault_client.get_kv, path=self._settings.path, key=key)
         if auth_key is None:
             raise ValueError("Failed to retrieve auth key from Vault")
+
+        # Evict oldest entries (dicts keep insertion order) to bound memory
+        cache.pop(key, None)
+        while len(cache) >= _SECRET_CACHE_MAX:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = (time.monotonic(), auth_key)
         return auth_key
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:  # noqa: ARG002
+        try:
+            yield
+        finally:
+            await self._client.aclose()
+            self._vault_client.close()
+            self._log_listener.stop()
+
     def __init__(self,
                  settings: Optional["MCPAdapterProxy.Settings"] = None,
                  args: Optional[argparse.Namespace] = None) -> None:
@@ -153,15 +212,35 @@ class MCPAdapterProxy:
             settings = MCPAdapterProxy.build_settings_from_args(args)
         self._settings = settings
 
-        # Logging setup using configured log level
-        logging.basicConfig(
-            level=getattr(logging, str(
-                self._settings.log_level).upper(), logging.INFO),
-            format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        )
+        # Logging setup using configured log level. Records are queued and
+        # written by a listener thread so request handlers never block on stderr.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, respect_handler_level=True)
+        self._log_listener.start()
+        root_logger = logging.getLogger()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        root_logger.setLevel(getattr(logging, str(
+            self._settings.log_level).upper(), logging.INFO))
         _logger = logging.getLogger("mcp_adapter")
 
-        self.app = FastAPI(title="LiteLLM <-> OpenWebUI MCP Adapter")
+        # Single upstream client shared by all requests so connections to
+        # LiteLLM are pooled and kept alive rather than re-opened per call.
+        self._client: httpx.AsyncClient = httpx.AsyncClient(
+            http2=self._settings.upstream_http2,
+            timeout=self._settings.timeout,
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=30,
+            ),
+        )
+
+        self.app = FastAPI(title="LiteLLM <-> OpenWebUI MCP Adapter",
+                           lifespan=self._lifespan)
 
         # Optional CORS
         if self._settings.enable_cors:
@@ -179,28 +258,45 @@ class MCPAdapterProxy:
             token=self._settings.token,
             mount=self._settings.mount,
         )
+        # Static upstream headers, copied per request before adding Authorization
+        self._base_fwd_headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+            # tunnel the auth details to the MCP server.
+            "x-mcp-securedata-auth": "Bearer MarkParris3134",
+        }
+        # bearer key -> (fetched at monotonic time, Vault secret)
+        self._secret_cache: Dict[str, tuple[float, str]] = {}
 
         settings_snapshot = {
             "app_title": self.app.title,
             "litellm_url": self._settings.litellm_url,
             "timeout": self._settings.timeout,
+            "upstream_http2": self._settings.upstream_http2,
             "log_level": self._settings.log_level,
             "enable_cors": self._settings.enable_cors,
             "cors_allow_origins": self._settings.cors_allow_origins,
             "bind_host": getattr(self._args, "host", "0.0.0.0"),
             "bind_port": getattr(self._args, "port", 8088),
+            "workers": getattr(self._args, "workers", 1),
         }
-        _logger.info("Adapter settings: %s", json.dumps(
-            settings_snapshot, ensure_ascii=False))
+        _logger.info("Adapter settings: %s", orjson.dumps(
+            settings_snapshot).decode("utf-8"))
+
+        # (epoch second, date iso, timestamp iso) reused by /health within the same second
+        self._health_now: tuple[int, str, str] = (0, "", "")
 
         # Routes defined within init to capture `self`
         @self.app.get("/health")
         async def health() -> Dict[str, Any]:
-            now = datetime.now(timezone.utc)
+            second = int(time.time())
+            if self._health_now[0] != second:
+                now = datetime.fromtimestamp(second, timezone.utc)
+                self._health_now = (second, now.date().isoformat(), now.isoformat())
+            _, date_iso, ts_iso = self._health_now
             return {
                 "status": "ok",
-                "date": now.date().isoformat(),
-                "timestamp": now.isoformat(),
+                "date": date_iso,
+                "timestamp": ts_iso,
                 "service": {
                     "title": self.app.title,
                     "description": "Adapter proxying /mcp-rest/tools/call to LiteLLM",
@@ -216,7 +312,13 @@ class MCPAdapterProxy:
 
         @self.app.options("/mcp-rest/tools/call/{tool_id:path}")
         async def options_tool(tool_id: str) -> Response:  # noqa: ARG001
-            return Response(status_code=204)
+            return _PREFLIGHT_204
+
+        # Hot-path attributes bound once as closure locals for call_tool
+        litellm_url = self._settings.litellm_url
+        client = self._client
+        base_fwd_headers = self._base_fwd_headers
+        secret_for = self._secret_for_authorization
 
         @self.app.post("/mcp-rest/tools/call/{tool_id:path}")
         async def call_tool(tool_id: str, request: Request) -> Response:
@@ -227,59 +329,58 @@ class MCPAdapterProxy:
 
             if content_type.startswith("application/json") and body_bytes:
                 try:
-                    parsed = json.loads(body_bytes.decode("utf-8"))
+                    parsed = orjson.loads(body_bytes)
                     if isinstance(parsed, dict):
                         body_json = parsed
                 except Exception as e:  # pragma: no cover - log parse errors
                     logging.warning("Invalid JSON body: %s", e)
 
-            # Build payload for LiteLLM
+            # Build payload for LiteLLM; a body already in LiteLLM shape is
+            # forwarded as the original bytes rather than re-serialised.
             payload: Dict[str, Any]
-            if body_json is None:
-                # No/invalid JSON: treat as empty arguments
-                payload = {"name": tool_id, "arguments": {}}
+            raw_forward: Optional[bytes] = None
+            name = body_json.get("name") if body_json else None
+            args = body_json.get("arguments") if body_json else None
+            if name is not None and args is not None:
+                payload = body_json  # type: ignore[assignment]
+                raw_forward = body_bytes
+            elif isinstance(args, dict):
+                # Add name if missing
+                payload = {"name": name or tool_id, "arguments": args}
             else:
-                if "name" in body_json and "arguments" in body_json:
-                    payload = body_json
-                elif "arguments" in body_json and isinstance(body_json["arguments"], dict):
-                    # Add name if missing
-                    payload = {"name": body_json.get(
-                        "name", tool_id), "arguments": body_json["arguments"]}
-                else:
-                    # Treat whole body as arguments
-                    payload = {"name": tool_id, "arguments": body_json}
-
-            # Forward Authorization
-            fwd_headers: Dict[str, str] = {"Content-Type": "application/json"}
-            litellm_auth_key = ""
-            try:
-                auth: str = request.headers.get("authorization", "")
-                litellm_auth_key = self._fetch_secret_for_authorization(
-                    authorization=auth)
-                auth = f"Bearer {litellm_auth_key}"
-                if auth:
-                    fwd_headers["Authorization"] = auth
-            except Exception as e:
-                logging.warning(
-                    "Failed to forward Authorization header: %s", e)
-
-            # Print incoming request headers to stdout
-            try:
-                headers_dict = {k: v for k, v in request.headers.items()}
-                print(json.dumps(
-                    {"incoming_request_headers": headers_dict}, ensure_ascii=False))
-            except Exception as e:
-                print(f"Failed to serialize headers: {e}")
+                # Treat whole body as arguments; no/invalid JSON means empty arguments
+                payload = {"name": tool_id, "arguments": body_json or {}}
 
-            # POST to LiteLLM endpoint
+            # Resolve the LiteLLM key for the caller's bearer token
+            auth: str = request.headers.get("authorization", "")
+            try:
+                litellm_auth_key = await secret_for(auth)
+            except ValueError as e:
+                logging.warning("Rejected Authorization header: %s", e)
+                return JSONResponse({"detail": "Unauthorized", "error": str(e)}, status_code=401)
+            except VaultError as e:
+                logging.error("Vault lookup error: %s", e)
+                return JSONResponse({"detail": "Vault unavailable", "error": str(e)}, status_code=502)
+            fwd_headers: Dict[str, str] = {
+                **base_fwd_headers, "Authorization": f"Bearer {litellm_auth_key}"}
+
+            # Log incoming request headers only when debugging; the Headers
+            # object is formatted lazily by logging, never copied into a dict.
+            if _logger.isEnabledFor(logging.DEBUG):
+                _logger.debug("incoming_request_headers=%r", request.headers)
+
+            # POST to LiteLLM endpoint. Calls are not micro-batched: LiteLLM's
+            # /mcp-rest/tools/call takes exactly one {"name", "arguments"} per
+            # request, so concurrency comes from the shared pooled client instead.
             try:
-                # tunnel the auth details to the MCP server.
-                fwd_headers["x-mcp-securedata-auth"] = f"Bearer MarkParris3134"
-                async with httpx.AsyncClient(timeout=self._settings.timeout) as client:
-                    r = await client.post(self._settings.litellm_url, json=payload, headers=fwd_headers)
-                # Pass through response
+                content = raw_forward if raw_forward is not None else orjson.dumps(payload)
+                upstream_req = client.build_request(
+                    "POST", litellm_url, content=content, headers=fwd_headers)
+                r = await client.send(upstream_req, stream=True)
+                # Stream the response through; the upstream response is closed once sent
                 media_type = r.headers.get("content-type", "application/json")
-                return Response(content=r.content, status_code=r.status_code, media_type=media_type)
+                return StreamingResponse(r.aiter_bytes(), status_code=r.status_code,
+                                         media_type=media_type, background=BackgroundTask(r.aclose))
             except httpx.RequestError as e:
                 logging.error("Upstream request error: %s", e)
                 return JSONResponse({"detail": "Upstream unavailable", "error": str(e)}, status_code=502)
@@ -290,8 +391,22 @@ class MCPAdapterProxy:
             self._args, "host", "0.0.0.0")
         port_val: int = port if port is not None else getattr(
             self._args, "port", 8088)
+        workers: int = getattr(self._args, "workers", 1)
+        if workers > 1:
+            # Each worker process re-parses the CLI args and builds its own adapter
+            uvicorn.run(f"{_MODULE_NAME}:app_factory", host=host_val, port=port_val,
+                        log_level=self._settings.log_level,
+                        loop=_UVICORN_LOOP, http=_UVICORN_HTTP,
+                        workers=workers, factory=True)
+            return
         uvicorn.run(self.app, host=host_val, port=port_val,
-                    log_level=self._settings.log_level)
+                    log_level=self._settings.log_level,
+                    loop=_UVICORN_LOOP, http=_UVICORN_HTTP)
+
+
+def app_factory() -> FastAPI:
+    """Build the adapter app from CLI args; used by uvicorn when running multiple workers."""
+    return MCPAdapterProxy().app
 
 
 if __name__ == "__main__":
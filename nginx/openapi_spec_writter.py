@@ -5,9 +5,10 @@ import socket
 import subprocess
 import sys
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 #
 # This uses MCPO as a bit of cheat, as MCPO can interrogate an standard MCP server and extract the OpenAPI spec (openapi.json).
@@ -55,11 +56,20 @@ def find_free_port() -> int:
         return s.getsockname()[1]
 
 
-def wait_for(url: str, timeout: float = 20.0, interval: float = 0.25) -> None:
+def make_session() -> requests.Session:
+    # Single keep-alive connection reused for readiness polls and the spec fetch
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return s
+
+
+def wait_for(url: str, timeout: float = 20.0, interval: float = 0.25,
+             session: Optional[requests.Session] = None) -> None:
+    s = session or make_session()
     start = time.time()
     while True:
         try:
-            r = requests.get(url, timeout=3)
+            r = s.get(url, timeout=3)
             if r.status_code == 200:
                 return
         except Exception:
@@ -70,20 +80,14 @@ def wait_for(url: str, timeout: float = 20.0, interval: float = 0.25) -> None:
 
 
 def rewrite_paths(spec: Dict[str, Any], base_path: str, server_label: str) -> Dict[str, Any]:
-    def last_segment(p: str) -> str:
-        parts = [seg for seg in p.split("/") if seg]
-        return parts[-1] if parts else ""
-
-    new_paths: Dict[str, Any] = {}
-    for path, item in (spec.get("paths") or {}).items():
-        suffix = last_segment(path)
-        if not suffix:
-            continue
-        new_key = f"{base_path.rstrip('/')}/{server_label}-{suffix}"
-        new_paths[new_key] = item
-    out = dict(spec)
-    out["paths"] = new_paths
-    return out
+    base = base_path.rstrip("/")
+    # Last non-empty path segment is the tool name; paths without one are dropped
+    new_paths: Dict[str, Any] = {
+        f"{base}/{server_label}-{suffix}": item
+        for path, item in (spec.get("paths") or {}).items()
+        if (suffix := path.rstrip("/").rsplit("/", 1)[-1])
+    }
+    return {**spec, "paths": new_paths}
 
 
 def main():
@@ -138,14 +142,15 @@ def main():
     ]
 
     proc = None
+    session = make_session()
     try:
         proc = subprocess.Popen(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         # Wait until openapi.json is live
-        wait_for(openapi_url, timeout=args.timeout)
+        wait_for(openapi_url, timeout=args.timeout, session=session)
 
         # Fetch spec
-        spec = requests.get(openapi_url, timeout=10).json()
+        spec = session.get(openapi_url, timeout=10).json()
 
         # Rewrite paths
         rewritten = rewrite_paths(
@@ -160,6 +165,7 @@ def main():
                 json.dump(rewritten, f, indent=2, ensure_ascii=False)
             print(f"Wrote {args.output}")
     finally:
+        session.close()
         if proc is not None:
             proc.terminate()
             try:
@@ -12,16 +12,19 @@ from __future__ import annotations
 import json
 import sys
 import argparse
-import urllib.request
-import urllib.error
 from typing import Any, Optional
 
+import httpx
+import orjson
+
 
 class VaultError(RuntimeError):
     pass
 
 
 class VaultClient:
+    __slots__ = ("addr", "token", "mount", "timeout", "_http", "_ver_cache")
+
     def __init__(self,
                  addr: str,
                  token: str,
@@ -31,37 +34,69 @@ class VaultClient:
         self.token = token
         self.mount = mount.strip("/")
         self.timeout = timeout
+        # Keep-alive connection pool reused across reads
+        self._http = httpx.Client(
+            base_url=self.addr,
+            headers={
+                "X-Vault-Token": self.token,
+                "Accept": "application/json",
+            },
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=10),
+            follow_redirects=True,
+        )
+        # mount -> KV version; mounts do not change engine version at runtime
+        self._ver_cache: dict[str, int] = {}
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._http.close()
+
+    def __enter__(self) -> "VaultClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     def _req(self, method: str, path: str) -> Any:
         url = f"{self.addr}{path}"
-        req = urllib.request.Request(url, method=method, headers={
-            "X-Vault-Token": self.token,
-            "Accept": "application/json",
-        })
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                data = resp.read()
-        except urllib.error.HTTPError as e:
-            body = e.read().decode("utf-8", errors="replace") if hasattr(e, 'read') else ""
-            raise VaultError(f"HTTP {e.code} for {url}: {body}") from None
-        except urllib.error.URLError as e:
+            resp = self._http.request(method, path)
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise VaultError(f"HTTP {e.response.status_code} for {url}: {e.response.text}") from None
+        except httpx.RequestError as e:
             raise VaultError(f"URL error for {url}: {e}") from None
+        if resp.status_code == 204:
+            return {}
+        data = resp.content
         if not data:
             return {}
         try:
-            return json.loads(data.decode("utf-8"))
-        except json.JSONDecodeError:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
             raise VaultError(f"Non-JSON response from {url}") from None
 
     def detect_kv_version(self, mount: Optional[str] = None) -> int:
-        """Return 1 or 2 based on mount options; defaults to 1 if unknown."""
+        """Return 1 or 2 based on mount options; defaults to 1 if unknown.
+        Results are cached per mount; see refresh_mounts()."""
         mnt = (mount or self.mount).strip("/")
+        cached = self._ver_cache.get(mnt)
+        if cached is not None:
+            return cached
         resp = self._req("GET", "/v1/sys/mounts")
         try:
             version = resp["data"][f"{mnt}/"]["options"].get("version", "1")
         except Exception:
-            return 1
-        return 2 if str(version) == "2" else 1
+            ver = 1
+        else:
+            ver = 2 if str(version) == "2" else 1
+        self._ver_cache[mnt] = ver
+        return ver
+
+    def refresh_mounts(self) -> None:
+        """Forget cached KV versions so the next read re-detects them."""
+        self._ver_cache.clear()
 
     def get_kv(self,
                path: str,
@@ -92,7 +127,10 @@ class VaultClient:
         return str(val)
 
 
-def _parse_args(argv: list[str]) -> argparse.Namespace:
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Get a value from HashiCorp Vault KV")
     p.add_argument("--addr", "-a", default="http://localhost:8200",
@@ -113,23 +151,35 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
                      help="Print JSON {key:value}")
     out.add_argument("--export", action="store_true",
                      help="Print KEY=VALUE export format")
-    return p.parse_args(argv)
+    return p
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once and reuse it when main() is called repeatedly."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    return _get_parser().parse_args(argv)
 
 
 def main(argv: list[str]) -> int:
     args = _parse_args(argv)
-    client = VaultClient(addr=args.addr,
-                         token=args.token,
-                         mount=args.mount,
-                         timeout=args.timeout)
-    try:
-        value = client.get_kv(
-            path=args.path,
-            key=args.key,
-            version=args.version)
-    except VaultError as e:
-        print(f"ERROR: {e}", file=sys.stderr)
-        return 2
+    with VaultClient(addr=args.addr,
+                     token=args.token,
+                     mount=args.mount,
+                     timeout=args.timeout) as client:
+        try:
+            value = client.get_kv(
+                path=args.path,
+                key=args.key,
+                version=args.version)
+        except VaultError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
     if value is None:
         print("", end="")
         return 3
@@ -20,6 +20,7 @@ log "  MCPO_TARGET_URL=${MCPO_TARGET_URL:-not set}"
 log "  OPENWEB_TO_LITELLM=${OPENWEB_TO_LITELLM:-not set}"
 log "  ADAPTER_HOST=${ADAPTER_HOST:-0.0.0.0}"
 log "  ADAPTER_PORT=${ADAPTER_PORT:-8088}"
+log "  ADAPTER_WORKERS=${ADAPTER_WORKERS:-1}"
 log "  ADAPTER_LITELLM_URL=${ADAPTER_LITELLM_URL:-http://litellm:4000/mcp-rest/tools/call}"
 log "  ADAPTER_TIMEOUT=${ADAPTER_TIMEOUT:-30}"
 log "  ADAPTER_LOG_LEVEL=${ADAPTER_LOG_LEVEL:-info}"
@@ -80,6 +81,7 @@ elif [ "$OPENWEB_TO_LITELLM" = "1" ] || [ "$OPENWEB_TO_LITELLM" = "true" ]; then
 
     ADAPTER_HOST=${ADAPTER_HOST:-0.0.0.0}
     ADAPTER_PORT=${ADAPTER_PORT:-8088}
+    ADAPTER_WORKERS=${ADAPTER_WORKERS:-1}
     ADAPTER_LITELLM_URL=${ADAPTER_LITELLM_URL:-http://litellm:4000/mcp-rest/tools/call}
     ADAPTER_TIMEOUT=${ADAPTER_TIMEOUT:-30}
     ADAPTER_LOG_LEVEL=${ADAPTER_LOG_LEVEL:-info}
@@ -88,6 +90,7 @@ elif [ "$OPENWEB_TO_LITELLM" = "1" ] || [ "$OPENWEB_TO_LITELLM" = "true" ]; then
     CMD=(python -u ./nginx/litellm-to-openwebui-proxy.py \
         --host "${ADAPTER_HOST}" \
         --port "${ADAPTER_PORT}" \
+        --workers "${ADAPTER_WORKERS}" \
         --litellm-url "${ADAPTER_LITELLM_URL}" \
         --timeout "${ADAPTER_TIMEOUT}" \
         --log-level "${ADAPTER_LOG_LEVEL}")
@@ -0,0 +1,14 @@
+import importlib.util
+
+import httpx
+
+# Shared outbound HTTP client (JWKS refresh, Keycloak calls) so connections
+# are pooled and kept alive across requests instead of re-handshaking. It lives
+# for the whole process; HTTP/2 is only requested when h2 is installed, since
+# httpx raises at construction otherwise.
+client = httpx.AsyncClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30.0,
+    verify=True,
+)
@@ -1,20 +1,135 @@
-from jose import jwt
+import asyncio
+import functools
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
 from fastapi import Request, HTTPException
 from fastapi.security import HTTPBearer
-import httpx
+
+from _http import client
 
 OIDC_ISSUER = "https://keycloak.test/realms/openwebui"
 OIDC_JWKS_URL = f"{OIDC_ISSUER}/protocol/openid-connect/certs"
 OIDC_AUDIENCE = "openwebui"
 security = HTTPBearer()
 
+# Decode parameters built once rather than per request
+_ALGS = ["RS256"]
+_DECODE_OPTIONS = {"require": ["exp", "iat"]}
+
+# Verified claims reused for repeat bearer tokens, bounded in size and age
+_CLAIMS_CACHE_TTL = 60.0
+_CLAIMS_CACHE_MAX = 1024
+# token -> (valid until monotonic time, claims)
+_claims_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+class _JwksCache:
+    """JWKS fetched lazily on first use and refreshed once `ttl` seconds have passed.
+
+    Forced refreshes are allowed at most once per `min_refresh` seconds, so
+    tokens with unknown kids or bad signatures cannot drive Keycloak fetches.
+    """
+
+    def __init__(self, url: str, ttl: float = 600.0, min_refresh: float = 30.0) -> None:
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh = min_refresh
+        self.keys: Optional[Dict[str, Any]] = None
+        self.exp = 0.0
+        self.fetched = float("-inf")
+        self.etag: Optional[str] = None
+        self.lock = asyncio.Lock()
+
+    def may_force(self) -> bool:
+        return time.monotonic() - self.fetched >= self.min_refresh
+
+    async def get(self, force: bool = False) -> Dict[str, Any]:
+        if not force and self.keys and time.monotonic() < self.exp:
+            return self.keys
+        async with self.lock:
+            # Another coroutine may have refreshed while we waited for the lock
+            if (not force or not self.may_force()) and self.keys and time.monotonic() < self.exp:
+                return self.keys
+            # Conditional GET: an unchanged set comes back as an empty 304
+            headers = {"If-None-Match": self.etag} if self.etag and self.keys else {}
+            r = await client.get(self.url, headers=headers)
+            self.fetched = time.monotonic()
+            if r.status_code == 304 and self.keys:
+                self.exp = time.monotonic() + self.ttl
+                return self.keys
+            r.raise_for_status()
+            self.keys = r.json()
+            self.etag = r.headers.get("ETag")
+            self.exp = time.monotonic() + self.ttl
+            # Keys may have rotated; drop parsed keys built from the old set
+            _key_for.cache_clear()
+            return self.keys
+
+
 # Cached JWKs
-jwks = httpx.get(OIDC_JWKS_URL).json()
+_jwks = _JwksCache(OIDC_JWKS_URL)
 
-def verify_token(request: Request):
-    token = security(request)
-    try:
-        claims = jwt.decode(token.credentials, jwks, algorithms=["RS256"], audience=OIDC_AUDIENCE)
+
+@functools.lru_cache(maxsize=8)
+def _key_for(kid: Optional[str]):
+    """Parsed public key for `kid` from the current JWKS; cleared whenever it is refreshed."""
+    for jwk in (_jwks.keys or {}).get("keys", []):
+        if jwk.get("kid") == kid:
+            return jwt.PyJWK(jwk).key
+    raise jwt.InvalidKeyError(f"No JWKS key for kid {kid}")
+
+
+def _decode(token: str, signing_key) -> dict:
+    return jwt.decode(token, signing_key, algorithms=_ALGS, audience=OIDC_AUDIENCE,
+                      options=_DECODE_OPTIONS)
+
+
+def _cached_claims(token: str) -> Optional[dict]:
+    entry = _claims_cache.get(token)
+    if entry is None:
+        return None
+    if time.monotonic() < entry[0]:
+        return entry[1]
+    _claims_cache.pop(token, None)
+    return None
+
+
+def _cache_claims(token: str, claims: dict) -> None:
+    # Never keep claims past the token's own expiry
+    ttl = min(_CLAIMS_CACHE_TTL, claims["exp"] - time.time())
+    if ttl <= 0:
+        return
+    while len(_claims_cache) >= _CLAIMS_CACHE_MAX:
+        _claims_cache.pop(next(iter(_claims_cache)))
+    _claims_cache[token] = (time.monotonic() + ttl, claims)
+
+
+async def verify_token(request: Request):
+    """Return the claims of the request's bearer JWT.
+
+    Claims come from the token itself once signature, audience and expiry are
+    verified; Keycloak's userinfo endpoint is deliberately not called per request.
+    """
+    token = await security(request)
+    claims = _cached_claims(token.credentials)
+    if claims is not None:
         return claims
+    try:
+        kid = jwt.get_unverified_header(token.credentials).get("kid")
+        try:
+            await _jwks.get()
+            claims = _decode(token.credentials, _key_for(kid))
+        except (jwt.InvalidSignatureError, jwt.InvalidKeyError):
+            # Keys may have rotated; refresh the JWKS once and retry, unless it
+            # was fetched recently, in which case the token is rejected as is
+            if not _jwks.may_force():
+                raise
+            await _jwks.get(force=True)
+            claims = _decode(token.credentials, _key_for(kid))
     except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+    # Only successfully verified tokens are cached
+    _cache_claims(token.credentials, claims)
+    return claims
@@ -1,4 +1,7 @@
+import asyncio
+import importlib.util
 import logging
+import time
 import httpx
 import argparse
 from fastmcp import FastMCP
@@ -6,18 +9,30 @@ from fastmcp.server.dependencies import get_http_headers
 from pydantic import Field
 from typing import Annotated, Dict, Any, Optional
 from store import SecureStore
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    import uvloop as _uvloop
+except ImportError:  # e.g. Windows; fall back to the stock asyncio loop
+    _uvloop = None
+_UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
 
 # Configure basic logging at DEBUG level
 logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+# Records never include thread/process details, so skip collecting them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
 
 class DataGroupServiceServer:
     """Class-based MCP server exposing key-value tools."""
 
+    __slots__ = ("logger", "store", "_host", "_port", "_token", "mcp")
+
     def __init__(self, host: str = "0.0.0.0",
                  port: int = 9123,
                  token: Optional[str] = None) -> None:
@@ -38,7 +53,11 @@ class DataGroupServiceServer:
         return f"{scheme}://{self._host}:{self._port}"
 
     def _register_tools(self) -> None:
-        """Register MCP tools, capturing `self` via closure."""
+        """Register MCP tools, capturing the store and logger via closure."""
+        # Bound as locals so each tool call does one closure-cell load
+        # instead of an attribute lookup on `self`.
+        store = self.store
+        logger = self.logger
 
         @self.mcp.tool(name="put_key_value", description="Store a key:value associated with an access group")
         async def put_key_value(
@@ -47,12 +66,12 @@ class DataGroupServiceServer:
             group: Annotated[str, Field(
                 description="The access group for this key-value pair")]
         ) -> Dict[str, Any]:
-            self.logger.debug(
-                f"put_key_value called with key={key}, group={group}")
-            headers = get_http_headers()
-            self.logger.debug(f"Headers: {headers}")
-            res = self.store.put(key, value, group)
-            self.logger.debug(f"put_key_value returned {res}")
+            logger.debug(
+                "put_key_value called with key=%s, group=%s", key, group)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Headers: %r", get_http_headers())
+            res = store.put(key, value, group)
+            logger.debug("put_key_value returned %s", res)
             return res
 
         @self.mcp.tool(name="get_value_by_key", description="Retrieve value for a key if access group matches")
@@ -61,36 +80,46 @@ class DataGroupServiceServer:
             group: Annotated[str, Field(
                 description="The access group to check against")]
         ) -> Dict[str, Any]:
-            self.logger.debug(
-                f"get_value_by_key called with key={key}, group={group}")
-            headers = get_http_headers()
-            self.logger.debug(f"Headers: {headers}")            
-            res = self.store.get(key, group)
-            self.logger.debug(f"get_value_by_key returned {res}")
+            logger.debug(
+                "get_value_by_key called with key=%s, group=%s", key, group)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Headers: %r", get_http_headers())
+            res = store.get(key, group)
+            logger.debug("get_value_by_key returned %s", res)
             return res
 
         @self.mcp.tool(name="test", description="Test tool that returns server name and current datetime")
         async def test() -> Dict[str, Any]:
             """Test tool that returns the MCP server name and current datetime"""
-            self.logger.debug("test tool called")
+            logger.debug("test tool called")
             headers = get_http_headers()
-            self.logger.debug(f"Headers: {headers}")
+            logger.debug("Headers: %r", headers)
+            # One clock read for both timestamps (utcnow() is deprecated)
+            utc = datetime.fromtimestamp(time.time_ns() / 1_000_000_000, tz=timezone.utc)
+            local = utc.astimezone().replace(tzinfo=None)
             result = {
                 "server_name": "DataGroupService",
-                "current_datetime": datetime.now().isoformat(),
-                "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+                "current_datetime": local.isoformat(),
+                "timestamp_utc": utc.replace(tzinfo=None).isoformat() + "Z",
                 "headers": headers,
             }
-            self.logger.debug(f"test tool returned {result}")
+            logger.debug("test tool returned %s", result)
             return result
 
     def run(self, log_level: str = "debug") -> None:
         self.logger.debug("Starting MCP server...")
+        # FastMCP starts uvicorn inside its own event loop, so uvloop has to be
+        # selected via the loop policy rather than uvicorn's `loop` option.
+        # Single process only: the store is in memory and MCP sessions are
+        # per process, so multiple workers would split state between them.
+        if _uvloop is not None:
+            asyncio.set_event_loop_policy(_uvloop.EventLoopPolicy())
         self.mcp.run(
             transport="streamable-http",
             host=self._host,
             port=self._port,
             log_level=log_level,
+            uvicorn_config={"http": _UVICORN_HTTP},
         )
         self.logger.debug("MCP server stopped")
 
@@ -1,27 +1,40 @@
-from typing import Dict, Set, Any
+from typing import Dict, Set, Tuple, Any
+
+# Static error codes clients can branch on without parsing the message text
+KEY_NOT_FOUND = "key_not_found"
+GROUP_MISSING = "group_missing"
 
 
 class SecureStore:
+    """In-memory key/value store with per-group access.
+
+    Methods are synchronous and never await, and the MCP server runs them on a
+    single event loop in one process, so each call is atomic and no lock is
+    needed. Add one before sharing an instance across threads.
+    """
+
+    __slots__ = ("store", "acl")
+
     def __init__(self):
         self.store: Dict[str, str] = {}
-        self.groups: Dict[str, Set[str]] = {}
+        # (key, group) pairs granted access; one tuple hash per ACL check
+        self.acl: Set[Tuple[str, str]] = set()
 
     def put(self, key: str, value: str, group: str) -> Dict[str, Any]:
         # Check if key already exists in the specified group
-        if key in self.store and group in self.groups.get(key, set()):
-            self.store[key] = value
+        existed = (key, group) in self.acl
+        self.store[key] = value
+        if existed:
             return {"status": "updated", "key": key, "group": group}
-        else:
-            self.store[key] = value
-            if key in self.groups:
-                self.groups[key].add(group)
-            else:
-                self.groups[key] = {group}
-            return {"status": "created", "key": key, "group": group}
+        self.acl.add((key, group))
+        return {"status": "created", "key": key, "group": group}
 
     def get(self, key: str, group: str) -> Dict[str, Any]:
-        if key not in self.store:
-            return {"status": "error", "message": f"Key '{key}' not found"}
-        if group in self.groups.get(key, set()):
-            return {"status": "success", "key": key, "value": self.store[key], "group": group}
-        return {"status": "error", "message": f"Group {group} does not contain key {key}"}
+        value = self.store.get(key)
+        if value is None:
+            return {"status": "error", "code": KEY_NOT_FOUND, "key": key, "group": group,
+                    "message": f"Key '{key}' not found"}
+        if (key, group) in self.acl:
+            return {"status": "success", "key": key, "value": value, "group": group}
+        return {"status": "error", "code": GROUP_MISSING, "key": key, "group": group,
+                "message": f"Group {group} does not contain key {key}"}
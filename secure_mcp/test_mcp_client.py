@@ -5,11 +5,15 @@ MCP Streamable HTTP Client - Upgraded to follow official MCP library pattern
 
 import argparse
 import asyncio
-import json
+import importlib.util
+import os
 from typing import Optional
 from contextlib import AsyncExitStack
 import random
 import string
+import time
+import httpx
+import orjson
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
@@ -19,16 +23,64 @@ from mcp.client.streamable_http import streamablehttp_client
 # this allows us to test the litellm if forwarding Auth headers
 TEST_BEARER_TOKEN = "sk-test-123"
 
+# Error codes returned by the DataGroupService store (see store.py)
+ERROR_KEY_NOT_FOUND = "key_not_found"
+ERROR_GROUP_MISSING = "group_missing"
+
+# Idempotent tools whose results MCPClient may reuse, and the cache bounds
+_CACHEABLE_TOOLS = frozenset({"get_value_by_key"})
+_RESULT_CACHE_TTL = 60.0
+_RESULT_CACHE_MAX = 256
+
+# httpx raises at client construction if http2 is requested without h2
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Seconds a health socket client gets to send its request before being dropped
+_HEALTH_READ_TIMEOUT = 2.0
+
+# Alphabet for generated test keys, values and groups
+_RANDOM_CHARS = string.ascii_letters + string.digits
+
+
+def _mcp_http_client(headers: Optional[dict] = None,
+                     timeout: Optional[httpx.Timeout] = None,
+                     auth: Optional[httpx.Auth] = None) -> httpx.AsyncClient:
+    """httpx client factory for streamablehttp_client.
+
+    The transport owns and closes the client per session; this sizes its
+    keep-alive pool so the overlapping tool calls in run_tests reuse sockets.
+    HTTP/2 is negotiated (via ALPN) when the server URL is https and h2 is
+    installed, letting those calls multiplex on one connection.
+    """
+    return httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0),
+        auth=auth,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=30),
+    )
+
 
 class MCPClient:
     """MCP Client for interacting with an MCP Streamable HTTP server"""
 
+    __slots__ = ("session", "exit_stack", "_streams_context", "_session_context",
+                 "_result_cache", "_write_gen", "_tool_names", "_key_name", "_key_value", "_group_name", "_status_created")
+
     def __init__(self):
         # Initialize session and client objects
         self.session = None
         self.exit_stack = AsyncExitStack()
         self._streams_context = None
         self._session_context = None
+        # (tool name, sorted arguments) -> (cached at monotonic time, result)
+        self._result_cache: dict = {}
+        # Bumped around every non-cacheable call; a read only caches its result
+        # if no write started or finished while it was in flight
+        self._write_gen = 0
+        # Tool names from the last list_tools on this session, None until listed
+        self._tool_names: Optional[frozenset] = None
         # Generate random strings for key, value, and group
 
         # Initialize private member variables with random strings
@@ -39,17 +91,25 @@ class MCPClient:
 
     def _generate_random_string(self, prefix: str, length: int = 20) -> str:
         """Generate a random string with the given prefix and length"""
-        chars = string.ascii_letters + string.digits
-        random_part = ''.join(random.choice(chars)
-                              for _ in range(length - len(prefix) - 1))
+        random_part = ''.join(random.choices(
+            _RANDOM_CHARS, k=length - len(prefix) - 1))
         return f"{prefix}_{random_part}"
 
     def _extract_text_content(self, result):
         """Safely extract text content from MCP result"""
-        if hasattr(result.content[0], 'text'):
-            return result.content[0].text
-        else:
-            return str(result.content[0])
+        content = result.content[0]
+        text = getattr(content, 'text', None)
+        return text if text is not None else str(content)
+
+    def _is_cacheable_result(self, result) -> bool:
+        """Only successful JSON results are cached, never tool or store errors"""
+        if result.isError:
+            return False
+        try:
+            data = orjson.loads(self._extract_text_content(result))
+        except orjson.JSONDecodeError:
+            return False
+        return isinstance(data, dict) and data.get("status") != "error"
 
     async def connect_to_streamable_http_server(
         self, server_url: str, headers: Optional[dict] = None
@@ -58,9 +118,11 @@ class MCPClient:
         self._streams_context = streamablehttp_client(
             url=server_url,
             headers=headers or {},
+            httpx_client_factory=_mcp_http_client,
         )
         read_stream, write_stream, _ = await self._streams_context.__aenter__()
 
+        self._tool_names = None
         self._session_context = ClientSession(read_stream, write_stream)
         self.session = await self._session_context.__aenter__()
 
@@ -72,6 +134,7 @@ class MCPClient:
             raise RuntimeError("Not connected to MCP server")
 
         response = await self.session.list_tools()
+        self._tool_names = frozenset(tool.name for tool in response.tools)
         return response
 
     async def call_tool(self, tool_name: str, arguments: dict):
@@ -79,7 +142,30 @@ class MCPClient:
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
 
+        # Only read-only tools are served from the cache; any other call may
+        # mutate server state, so it invalidates everything cached so far.
+        if tool_name not in _CACHEABLE_TOOLS:
+            self._write_gen += 1
+            self._result_cache.clear()
+            try:
+                return await self.session.call_tool(tool_name, arguments)
+            finally:
+                self._write_gen += 1
+                self._result_cache.clear()
+
+        cache_key = (tool_name, tuple(sorted(arguments.items())))
+        now = time.monotonic()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None and now - cached[0] < _RESULT_CACHE_TTL:
+            return cached[1]
+
+        write_gen = self._write_gen
         result = await self.session.call_tool(tool_name, arguments)
+        if write_gen == self._write_gen and self._is_cacheable_result(result):
+            self._result_cache.pop(cache_key, None)
+            while len(self._result_cache) >= _RESULT_CACHE_MAX:
+                self._result_cache.pop(next(iter(self._result_cache)), None)
+            self._result_cache[cache_key] = (now, result)
         return result
 
     async def run_tests(self):
@@ -95,28 +181,41 @@ class MCPClient:
                 print(f"  - {tool.name}: {tool.description}")
 
             # Assert expected tools are available
-            tool_names = [tool.name for tool in tools_response.tools]
+            tool_names = {tool.name for tool in tools_response.tools}
             assert "put_key_value" in tool_names, "put_key_value tool not found"
             assert "get_value_by_key" in tool_names, "get_value_by_key tool not found"
             print("✓ Tool listing test passed")
 
+            # The put and the non-existent key lookup (test 5) are independent,
+            # so issue them concurrently; tests 3 and 4 need the put to land first.
+            non_existent_key = self._generate_random_string(
+                prefix="non_existent_key")
+            put_result, missing_result = await asyncio.gather(
+                self.call_tool(
+                    "put_key_value",
+                    {
+                        "key": self._key_name,
+                        "value": self._key_value,
+                        "group": self._group_name
+                    }
+                ),
+                self.call_tool(
+                    "get_value_by_key",
+                    {
+                        "key": non_existent_key,
+                        "group": self._group_name
+                    }
+                ),
+            )
+
             # Test 2: Store a key-value pair
             print("\n2. Testing put_key_value tool...")
-            put_result = await self.call_tool(
-                "put_key_value",
-                {
-                    "key": self._key_name,
-                    "value": self._key_value,
-                    "group": self._group_name
-                }
-            )
             print(f"Put result: {put_result.content}")
 
             # Parse and validate the result
-            import json
             # Safely extract text content
             put_text = self._extract_text_content(put_result)
-            put_data = json.loads(put_text)
+            put_data = orjson.loads(put_text)
             assert put_data[
                 "status"] == self._status_created, f"Expected status '{self._status_created}', got {put_data['status']}"
             assert put_data[
@@ -125,20 +224,32 @@ class MCPClient:
                 "group"] == self._group_name, f"Expected group '{self._group_name}', got {put_data['group']}"
             print("✓ Put key-value test passed")
 
+            # Tests 3 and 4 both read the stored key and can run concurrently
+            group_that_does_not_exist = "wrong_group"
+            get_result, access_result = await asyncio.gather(
+                self.call_tool(
+                    "get_value_by_key",
+                    {
+                        "key": self._key_name,
+                        "group": self._group_name
+                    }
+                ),
+                self.call_tool(
+                    "get_value_by_key",
+                    {
+                        "key": self._key_name,
+                        "group": group_that_does_not_exist
+                    }
+                ),
+            )
+
             # Test 3: Retrieve the stored value
             print("\n3. Testing get_value_by_key tool...")
-            get_result = await self.call_tool(
-                "get_value_by_key",
-                {
-                    "key": self._key_name,
-                    "group": self._group_name
-                }
-            )
             print(f"Get result: {get_result.content}")
 
             # Parse and validate the result
             get_text = self._extract_text_content(get_result)
-            get_data = json.loads(get_text)
+            get_data = orjson.loads(get_text)
             assert "value" in get_data, f"Unexpected response format missing [value] key: {get_data}"
             assert get_data[
                 "value"] == self._key_value, f"Expected value '{self._key_value}', got {get_data['value']}"
@@ -146,47 +257,44 @@ class MCPClient:
 
             # Test 4: Test access control (wrong group)
             print("\n4. Testing access control (wrong group)...")
-            group_that_does_not_exist = "wrong_group"
-            access_result = await self.call_tool(
-                "get_value_by_key",
-                {
-                    "key": self._key_name,
-                    "group": group_that_does_not_exist
-                }
-            )
             print(f"Access control result: {access_result.content}")
 
             # Parse and validate access denial
             access_text = self._extract_text_content(access_result)
-            access_data = json.loads(access_text)
-            # Check if access_data has the expected keys
-            assert "status" in access_data and "message" in access_data, f"JSON has unexpected format: {access_text}"
-            expect_status = f"Group {group_that_does_not_exist} does not contain key {self._key_name}"
-            assert access_data[
-                "message"] == expect_status, f"Expected '{expect_status}', got {access_data['message']}"
+            access_data = orjson.loads(access_text)
+            if "code" in access_data:
+                # Structured error: compare fields rather than formatted text
+                expect_error = {"status": "error", "code": ERROR_GROUP_MISSING,
+                                "key": self._key_name, "group": group_that_does_not_exist}
+                got_error = {k: access_data.get(k) for k in expect_error}
+                assert got_error == expect_error, f"Expected {expect_error}, got {got_error}"
+            else:
+                # Compat path for servers that only return a message
+                assert "status" in access_data and "message" in access_data, f"JSON has unexpected format: {access_text}"
+                expect_status = f"Group {group_that_does_not_exist} does not contain key {self._key_name}"
+                assert access_data[
+                    "message"] == expect_status, f"Expected '{expect_status}', got {access_data['message']}"
             print("✓ Access control test passed")
 
             # Test 5: Test non-existent key
             print("\n5. Testing non-existent key...")
-            non_existent_key = self._generate_random_string(
-                prefix="non_existent_key")
-            missing_result = await self.call_tool(
-                "get_value_by_key",
-                {
-                    "key": non_existent_key,
-                    "group": self._group_name
-                }
-            )
             print(f"Missing key result: {missing_result.content}")
 
             # Parse and validate key not found
             missing_text = self._extract_text_content(missing_result)
-            missing_data = json.loads(missing_text)
-            # Check if missing_data has the expected keys
-            assert "status" in missing_data and "message" in missing_data, f"Unexpected response format: {missing_text}"
-            expect_status = f"Key '{non_existent_key}' not found"
-            assert missing_data[
-                "message"] == expect_status, f"Expected '{expect_status}', got {missing_data['message']}"
+            missing_data = orjson.loads(missing_text)
+            if "code" in missing_data:
+                # Structured error: compare fields rather than formatted text
+                expect_error = {"status": "error", "code": ERROR_KEY_NOT_FOUND,
+                                "key": non_existent_key, "group": self._group_name}
+                got_error = {k: missing_data.get(k) for k in expect_error}
+                assert got_error == expect_error, f"Expected {expect_error}, got {got_error}"
+            else:
+                # Compat path for servers that only return a message
+                assert "status" in missing_data and "message" in missing_data, f"Unexpected response format: {missing_text}"
+                expect_status = f"Key '{non_existent_key}' not found"
+                assert missing_data[
+                    "message"] == expect_status, f"Expected '{expect_status}', got {missing_data['message']}"
             print("✓ Non-existent key test passed")
 
             print("\nAll tests passed successfully!")
@@ -206,46 +314,107 @@ class MCPClient:
             await self._streams_context.__aexit__(None, None, None)
 
 
+async def _health_probe(client):
+    """Check tools and a put/get round-trip on an already connected client"""
+    put = client.call_tool(
+        "put_key_value",
+        {"key": "health_check", "value": "ok", "group": "health"}
+    )
+    tool_names = client._tool_names
+    if tool_names is None:
+        # List tools once per session, while the put is in flight; later
+        # probes on the same session reuse the names
+        await asyncio.gather(client.list_tools(), put)
+        tool_names = client._tool_names
+    else:
+        await put
+
+    # Verify expected tools are available
+    if "put_key_value" not in tool_names or "get_value_by_key" not in tool_names:
+        return False
+
+    # Quick functional test: retrieve the stored value
+    get_result = await client.call_tool(
+        "get_value_by_key",
+        {"key": "health_check", "group": "health"}
+    )
+
+    # Verify the result
+    get_text = client._extract_text_content(get_result)
+    get_data = orjson.loads(get_text)
+
+    # Health success if retrieved value matches what we stored
+    return get_data.get("value") == "ok"
+
+
 async def health_check(client, server_url):
     """Run a quick health check for Docker health monitoring"""
     try:
         headers = {"Authorization": f"Bearer {TEST_BEARER_TOKEN}"} if TEST_BEARER_TOKEN else {}
         await client.connect_to_streamable_http_server(server_url, headers=headers)
+        return await _health_probe(client)
 
-        # Quick test: just list tools to verify server is responding
-        tools_response = await client.list_tools()
-        tool_names = [tool.name for tool in tools_response.tools]
-
-        # Verify expected tools are available
-        if "put_key_value" not in tool_names or "get_value_by_key" not in tool_names:
-            return False
+    except Exception as e:
+        print(f"Health check exception: {e}")
+        return False
 
-        # Quick functional test: store and retrieve a value
-        await client.call_tool(
-            "put_key_value",
-            {"key": "health_check", "value": "ok", "group": "health"}
-        )
 
-        get_result = await client.call_tool(
-            "get_value_by_key",
-            {"key": "health_check", "group": "health"}
-        )
+async def health_daemon(server_url, socket_path, interval, max_age):
+    """Probe the MCP server over one long-lived session and serve the result on a Unix socket.
 
-        # Verify the result
-        get_text = client._extract_text_content(get_result)
-        get_data = json.loads(get_text)
+    Replies 200 if the last successful probe is at most `max_age` seconds old,
+    else 503, so a Docker HEALTHCHECK can poll it without starting Python:
+        curl -fs --unix-socket /tmp/mcp-health.sock http://localhost/
+    """
+    last_ok = None
 
-        # Health success if retrieved value matches what we stored
-        return get_data.get("value") == "ok"
-
-    except Exception as e:
-        print(f"Health check exception: {e}")
-        return False
+    async def handle(reader, writer):
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), _HEALTH_READ_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        except asyncio.TimeoutError:
+            # Stalled client; close rather than hold the socket open forever
+            writer.close()
+            return
+        healthy = last_ok is not None and time.monotonic() - last_ok <= max_age
+        status = b"200 OK" if healthy else b"503 Service Unavailable"
+        body = b"ok\n" if healthy else b"unhealthy\n"
+        writer.write(b"HTTP/1.0 " + status +
+                     b"\r\nContent-Type: text/plain\r\nContent-Length: " +
+                     str(len(body)).encode() + b"\r\n\r\n" + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    headers = {"Authorization": f"Bearer {TEST_BEARER_TOKEN}"} if TEST_BEARER_TOKEN else {}
+    client = None
+    async with server:
+        while True:
+            try:
+                if client is None:
+                    client = MCPClient()
+                    await client.connect_to_streamable_http_server(server_url, headers=headers)
+                if await _health_probe(client):
+                    last_ok = time.monotonic()
+            except Exception as e:
+                print(f"Health probe exception: {e}")
+                # Drop the session and reconnect on the next probe
+                if client is not None:
+                    try:
+                        await client.cleanup()
+                    except Exception:
+                        pass
+                    client = None
+            await asyncio.sleep(interval)
 
 
 async def main():
     """Main function to run the MCP client"""
-    import os
     import sys
 
     parser = argparse.ArgumentParser(
@@ -266,12 +435,41 @@ async def main():
         help="Run health check mode for Docker health monitoring"
     )
 
+    parser.add_argument(
+        "--healthcheck-daemon",
+        action="store_true",
+        help="Keep one MCP session open, probe it periodically and serve the status on --health-socket"
+    )
+
+    parser.add_argument(
+        "--health-socket",
+        default="/tmp/mcp-health.sock",
+        help="Unix socket for --healthcheck-daemon (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--health-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between daemon probes (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        "--health-max-age",
+        type=float,
+        default=30.0,
+        help="Report unhealthy if the last good probe is older than this (default: %(default)s)"
+    )
+
     args = parser.parse_args()
 
     client = MCPClient()
 
     try:
-        if args.health_check:
+        if args.healthcheck_daemon:
+            await health_daemon(args.server_url, args.health_socket,
+                                args.health_interval, args.health_max_age)
+        elif args.health_check:
             # Health check mode - minimal output, exit codes for Docker
             success = await health_check(client, args.server_url)
             sys.exit(0 if success else 1)
@@ -300,4 +498,9 @@ async def main():
 
 if __name__ == "__main__":
     print("Starting MCP Streamable HTTP Client...")
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
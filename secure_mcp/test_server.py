@@ -1,8 +1,9 @@
+import importlib.util
+import os
 import uvicorn
 import logging
+from typing import Dict
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-import json
 
 """
 This Python script is a test server for the Model Context Protocol (MCP) `securedata` service,
@@ -18,11 +19,11 @@ Here is a breakdown of what the program does:
 - Initializes a FastAPI application: Sets up a web server that can handle incoming HTTP requests.
 - Defines Pydantic models: Creates data validation classes (`PutKeyValueFormModel` and `GetValueByKeyFormModel`)
   that match the expected JSON body for the MCP tool calls, ensuring incoming data has the correct structure.
-- Logs all incoming headers: A custom middleware intercepts every incoming HTTP request to log all request headers
-  to the console. This allows a developer to confirm that specific headers, like `x-mcp-securedata-auth`, are being
+- Logs all incoming headers: Every request handled by the server has its method, path and full set of request
+  headers logged to the console. This allows a developer to confirm that specific headers, like `x-mcp-securedata-auth`, are being
   received by the server.
-- Handles MCP tool endpoints: It defines API endpoints that match the MCP's OpenAPI specification
-  (`put_key_value`, `get_value_by_key`, and `test`).
+- Handles MCP tool endpoints: A single catch-all POST route serves every path in the MCP's OpenAPI
+  specification (`put_key_value`, `get_value_by_key`, and `test`) as well as `/` and `/mcp`.
 - Logs received data: For each tool call, the server logs the tool name and the data received in the request body.
 - Returns a static response: Each endpoint simply returns a static JSON response of `{"status": "failed"}`.
   It does not perform any actual MCP business logic, as its purpose is purely for testing connectivity and
@@ -35,87 +36,65 @@ debugging the communication flow between a client, a LiteLLM proxy, and the back
 evidence of whether expected headers are correctly propagated.
 """
 
+# Prefer uvloop and the httptools parser when installed; uvicorn defaults otherwise
+_UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+_UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
+# Import name of this file, used by uvicorn worker processes to locate `app`
+_MODULE_NAME = os.path.splitext(os.path.basename(__file__))[0]
+
 # Configure logging to display INFO level messages to the console
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
-# Pydantic models were used previously; endpoints now accept arbitrary JSON for flexibility.
-
-# Middleware to log all incoming request headers
+# Static reply for every call; the return annotation lets FastAPI serialize it
+# straight to JSON bytes through pydantic-core
+_OK_RESPONSE: Dict[str, str] = {"status": "ok"}
 
+# Upper bound on how much of each request body is logged
+_MAX_LOG_BODY = 4096
 
-@app.middleware("http")
-async def log_headers_middleware(request: Request, call_next):
-    logger.info("--- Incoming Start ---")
-    # Log method and exact path
-    logger.info("Request: %s %s", request.method, request.url.path)
-    # Log the full set of headers
-    logger.info("--- Incoming Request Headers ---")
-    for header, value in request.headers.items():
-        logger.info(f"{header}: {value}")
-    logger.info("--- Incoming End ---")
-    logger.info("--------------------")
-
-    # Process the request normally
-    response = await call_next(request)
-    return response
+# Pydantic models were used previously; endpoints now accept arbitrary JSON for flexibility.
 
-# Define the endpoint handlers
+# Headers are logged once per request, by _dump_request in the route handler.
 
 
 async def _dump_request(request: Request):
+    # Skip reading and decoding the body entirely when INFO is suppressed
+    if not logger.isEnabledFor(logging.INFO):
+        return
     logger.info("--- Incoming Request ---")
+    # Log method and exact path
+    logger.info("Request: %s %s", request.method, request.url.path)
     logger.info("Headers:")
     for header, value in request.headers.items():
-        logger.info(f"  {header}: {value}")
+        logger.info("  %s: %s", header, value)
     logger.info("Body:")
-    body = await request.body()
-    logger.info(f"  {body.decode('utf-8', errors='replace')}")
+    # Read incrementally and keep at most _MAX_LOG_BODY bytes rather than
+    # buffering the whole payload just to log it.
+    buf = bytearray()
+    truncated = False
+    async for chunk in request.stream():
+        room = _MAX_LOG_BODY - len(buf)
+        if len(chunk) > room:
+            buf.extend(chunk[:room])
+            truncated = True
+            break
+        buf.extend(chunk)
+    logger.info("  %s%s", buf.decode('utf-8', errors='replace'),
+                " ...[truncated]" if truncated else "")
     logger.info("----------------------------------")
 
 
-@app.post("/")
-async def home(request: Request):
-    logger.info("/")
-    await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
-
-
-@app.post("/mcp")
-async def mcp(request: Request):
-    logger.info("/mcp")
-    await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
-
-
-@app.post("/mcp/tools/call")
-async def tool_call(request: Request):
-    logger.info("/mcp/tools/call")
-    await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
-
-
-@app.post("/mcp/tools/call/put_key_value")
-async def tool_put_key_value(request: Request):
-    logger.info("/mcp/tools/call/put_key_value")
-    await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
-
-
-@app.post("/mcp/tools/call/get_value_by_key")
-async def tool_get_value_by_key(request: Request):
-    logger.info("/mcp/tools/call/get_value_by_key")
-    await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
-
-
-@app.post("/mcp/tools/call/test")
-async def tool_test(request: Request):
-    logger.info("/mcp/tools/call/test")
+@app.post("/{full_path:path}")
+async def catch_all(full_path: str, request: Request) -> Dict[str, str]:
+    # One route serves /, /mcp, /mcp/tools/call and /mcp/tools/call/<tool>;
+    # dispatch on full_path here if a path ever needs distinct behaviour.
+    logger.info("/%s", full_path)
     await _dump_request(request)
-    return JSONResponse(content={"status": "ok"})
+    return _OK_RESPONSE
 
 
 def main():
@@ -125,9 +104,19 @@ def main():
                         help="Bind host (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=9123,
                         help="Bind port (default: 9123)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for soak tests, e.g. CPU count / 2 (default: 1)")
     args = parser.parse_args()
 
-    uvicorn.run(app, host=args.host, port=args.port)
+    if args.workers > 1:
+        # The app is stateless, so workers need no coordination; uvicorn
+        # re-imports it by name in each worker process.
+        uvicorn.run(f"{_MODULE_NAME}:app", host=args.host, port=args.port,
+                    loop=_UVICORN_LOOP, http=_UVICORN_HTTP, access_log=False,
+                    workers=args.workers)
+        return
+    uvicorn.run(app, host=args.host, port=args.port,
+                loop=_UVICORN_LOOP, http=_UVICORN_HTTP, access_log=False)
 
 
 if __name__ == "__main__":